@@ -11,6 +11,7 @@ It also contains trivial functions that are used repeatedly throughout the code.
 """
 
 import os
+import re
 import sys
 import subprocess
 import asyncio
@@ -19,14 +20,11 @@ from enum import Enum
 from pathlib import Path
 from functools import wraps
 from time import time
-from copy import deepcopy
-from operator import itemgetter, attrgetter
+from operator import attrgetter
 from collections import deque
 
 import aiohttp
 
-from ._version import __version__
-
 
 class _g():
     ### Global variables used to store the state of the programme.
@@ -50,8 +48,38 @@ class _g():
                    }
     # aiohttp maximum concurrent requests & objects
     ahMaxRequests = 20
-    ahConnector = aiohttp.TCPConnector(limit=ahMaxRequests)
+    # PDFs are big, and publishers don't take kindly to lots of downloads at
+    # once, so fewer of these run at the same time.
+    ahMaxDownloads = 8
+    # Total number of connections that can be open at once. This is more than
+    # ahMaxRequests, so that PDF downloads and Crossref lookups to different
+    # hosts don't hold each other up.
+    ahMaxConnections = 64
+    # Options for every aiohttp.TCPConnector. DNS results and idle connections
+    # are kept for longer than aiohttp's defaults (10 s and 15 s), since the
+    # same few hosts (Crossref, doi.org, publishers) are contacted over and
+    # over again.
+    ahConnectorOptions = {"limit": ahMaxConnections,
+                          "limit_per_host": ahMaxRequests,
+                          "ttl_dns_cache": 300,
+                          "keepalive_timeout": 60}
+    # No limit on the total time, which big PDFs can easily exceed on slow
+    # connections; only give up if the server stops sending data.
+    ahTimeout = aiohttp.ClientTimeout(total=None, sock_read=60)
+    # Size of the read buffer for each response. The default (64 KB) makes
+    # aiohttp stop reading from the socket very often when downloading PDFs.
+    ahReadBufsize = 2 ** 22   # bytes
     ahSession = None   # this is set in main()
+    # Crossref responses are kept here, so that looking up the same DOI again
+    # (e.g. after deleting it, or in another database) doesn't need the
+    # network. Entries older than crossrefCacheAge are fetched afresh.
+    crossrefCacheDir = (Path(os.environ.get("XDG_CACHE_HOME")
+                             or Path.home() / ".cache")
+                        / "cygnet" / "crossref")
+    crossrefCacheAge = 90 * 24 * 60 * 60   # seconds
+    # Registration agency of each DOI prefix that Crossref couldn't find a
+    # DOI for. These don't change, so they are kept for good.
+    doiAgencyFile = crossrefCacheDir.parent / "agencies.json"
 
     # Debugging mode on/off. This is set by argv
     debug = None
@@ -123,6 +151,20 @@ class _g():
         '\u2013': '--',
         '\u2014': '---',
     }
+    # Translation table for str.translate(), which does all the replacements
+    # of single characters in one pass. Multi-character keys (e.g. letters
+    # followed by combining accents) can't go in the table, so they are
+    # matched by a regex instead (longest first), which is None if there
+    # aren't any.
+    unicodeLatexTable = str.maketrans({k: v for k, v in unicodeLatexDict.items()
+                                       if len(k) == 1})
+    unicodeLatexRegex = (
+        re.compile("|".join(re.escape(k)
+                            for k in sorted(unicodeLatexDict, key=len,
+                                            reverse=True)
+                            if len(k) > 1))
+        if any(len(k) > 1 for k in unicodeLatexDict) else None
+    )
 
     # Convert Greek letters to Unicode.
     greek2Unicode = {
@@ -308,7 +350,12 @@ def _saveHist(cmd, args):
     if _g.debug is True:
         _debug("saving history before command {}".format(cmd))
     _g.cmdHistory.append(cmd)
-    _g.articleListHistory.append(deepcopy(_g.articleList))
+    # Only the list itself is copied, so undo relies on every command that
+    # saves history (see _commands in prompt.py) replacing, adding, removing
+    # or reordering the entries of articleList, and never modifying an Article
+    # in place. (Commands that don't save history, like 'open' setting
+    # time_opened, are free to.)
+    _g.articleListHistory.append(list(_g.articleList))
 
 
 def _clearHist():
@@ -7,11 +7,9 @@ Autosave and backup functions which try to make sure that changes are not lost.
 
 import asyncio
 import filecmp
-from pathlib import Path
 from datetime import datetime
 from operator import attrgetter
 
-from . import commands
 from . import fileio
 from ._shared import *
 
@@ -52,8 +50,7 @@ def create_backup():
         dbName = _g.currentPath.name
         # Figure out the folder name
         backup_folder = _g.currentPath / "backups"
-        if not backup_folder.exists():
-            backup_folder.mkdir()
+        backup_folder.mkdir(exist_ok=True)
         # Create the backup file
         now = datetime.now().strftime(".%y%m%d_%H%M%S")
         backup_fname = backup_folder / (dbName + now)
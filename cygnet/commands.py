@@ -12,10 +12,8 @@ import subprocess
 import shutil
 import asyncio
 from pathlib import Path
-from copy import deepcopy
 from datetime import datetime, timezone
 from tempfile import NamedTemporaryFile
-from operator import attrgetter
 
 import yaml
 import prompt_toolkit as pt
@@ -23,7 +21,7 @@ import prompt_toolkit as pt
 from . import fileio
 from . import listprint
 from . import backup
-from .cygcls import Article, DOI, Spinner
+from .cygcls import Article, DOI, Spinner, invalidate_listings
 from ._shared import *
 
 
@@ -236,7 +234,7 @@ def cli_search(args):
 
 
 @_helpdeco
-def cli_open(args):
+async def cli_open(args):
     """
     *** open ***
 
@@ -302,11 +300,14 @@ def cli_open(args):
                     _error(f"open: ref {refno}: SI file {path} not found")
                     no += 1
                     continue
-            # Open it using open(1)
-            try:
-                subprocess.run(["open", path], check=True, capture_output=True)
-            except subprocess.CalledProcessError:
-                _error("open: ref {refno}: error opening file/URL {path}")
+            # Open it using open(1). This is run asynchronously so that it
+            # doesn't hold up any downloads in the background.
+            proc = await asyncio.create_subprocess_exec(
+                "open", str(path),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL)
+            if await proc.wait() != 0:
+                _error(f"open: ref {refno}: error opening file/URL {path}")
                 no += 1
             else:
                 yes += 1
@@ -454,6 +455,7 @@ def cli_edit(args):
             for old_fname, new_fname in zip(old_fnames, new_fnames):
                 if old_fname.is_file():
                     old_fname.rename(new_fname)
+                    invalidate_listings()
             # Ok, now we can replace it
             _g.articleList[refno - 1] = edited_article
             _g.changes += ["edit"]
@@ -501,14 +503,9 @@ async def cli_add(args):
     if dois == []:
         return
 
-    articles = []
-    coroutines = [DOI(doi).to_article_cr(_g.ahSession)
-                  for doi in dois]
     async with Spinner(message="Fetching metadata...",
                        total=len(dois)) as spinner:
-        for crt in asyncio.as_completed(coroutines):
-            articles.append(await crt)
-            spinner.increment(1)
+        articles = await DOI.to_articles_cr(dois, _g.ahSession, spinner)
 
     for article in articles:
         # Check for failure
@@ -631,29 +628,14 @@ async def cli_update(args):
     if len(refnos) == 0:
         return _error("update: no references selected")
 
-    # Lists containing old and new Articles. Since data is being pulled
-    # asynchronously, we need to be careful with the sorting. Throughout this
-    # section we sort every list by the DOIs.
     old_articles = [_g.articleList[r - 1] for r in refnos]
-    old_articles, refnos = zip(*sorted(zip(old_articles, refnos),
-                                       key=(lambda t: t[0].doi)))
-    crts = [article.to_newarticle_cr(_g.ahSession) for article in old_articles]
-    new_articles = []
-    # Perform asynchronous HTTP requests
+    # Perform asynchronous HTTP requests. The whole point is to get the latest
+    # metadata, so the Crossref cache is bypassed.
     async with Spinner(message="Fetching metadata...",
                        total=len(refnos)) as spinner:
-        for crt in asyncio.as_completed(crts):
-            new_articles.append(await crt)
-            spinner.increment(1)
-    # After we finish pulling the new Articles, they are out of order. We can
-    # sort the new Articles by DOI to get the same ordering as the old Articles
-    # and refnos.
-    new_articles.sort(key=attrgetter("doi"))
-    # Now we sort everything by refnos so that we can present them nicely to
-    # the user.
-    refnos, old_articles, new_articles = zip(*sorted(zip(refnos,
-                                                         old_articles,
-                                                         new_articles)))
+        new_articles = await DOI.to_articles_cr(
+            [article.doi for article in old_articles], _g.ahSession, spinner,
+            use_cache=False)
 
     # Present them one by one to the user
     yes = 0
@@ -735,6 +717,7 @@ async def cli_delete(args):
             pdf_paths = [article.to_fname(type) for type in ("pdf", "si")]
             for pdf in pdf_paths:
                 pdf.unlink(missing_ok=True)
+            invalidate_listings()
             # Then delete the article
             del _g.articleList[refno - 1]
             yes += 1
@@ -777,10 +760,11 @@ async def cli_import(args=None):
         files += [f for f in dir.iterdir() if f.suffix == ".pdf"]
 
     yes, no = 0, 0
+    # Scan all the PDFs for their DOIs at once. Adding them has to be done one
+    # at a time, though, because cli_add() prompts the user.
+    dois = await asyncio.gather(*(DOI.from_pdf_cr(file) for file in files))
     # Process every PDF file found.
-    for file in files:
-        # Try to get the DOI
-        doi = DOI.from_pdf(file)
+    for file, doi in zip(files, dois):
         if doi == _ret.FAILURE:
             no += 1
         else:
@@ -804,9 +788,22 @@ async def cli_import(args=None):
                     psrc = file
                     pdest = DOI(doi).to_article(metadata=False).to_fname("pdf")
                     # mkdir -p the folder if it doesn't already exist.
-                    if not pdest.parent.exists():
-                        pdest.parent.mkdir(parents=True)
-                    shutil.copy2(psrc, pdest)
+                    pdest.parent.mkdir(parents=True, exist_ok=True)
+                    # The article has been added either way, but the import
+                    # only counts as a success if the PDF made it over.
+                    try:
+                        # Nothing to do if it's already there (copyfile()
+                        # would complain).
+                        if not (pdest.exists() and psrc.samefile(pdest)):
+                            await asyncio.get_running_loop().run_in_executor(
+                                None, shutil.copyfile, psrc, pdest)
+                    except OSError as e:
+                        _error(f"import: could not copy '{psrc}' to "
+                               f"'{pdest}': {str(e)}")
+                        yes -= 1
+                        no += 1
+                    else:
+                        invalidate_listings()
     # Trigger autosave
     _g.changes += ["import"] * yes
     return yes, no
@@ -872,7 +869,7 @@ async def cli_addpdf(args):
             print(f"{_g.ansiBold}({r}) {article.authors[0]['family']} "
                   f"{article.year}:{_g.ansiReset} {article.title}", end="   ")
             availability = article.get_availability()
-            print(article.get_availability_string())
+            print(article.get_availability_string(availability))
 
             style = pt.styles.Style.from_dict({"prompt": _g.ptBlue,
                                                "": _g.ptGreen})
@@ -893,10 +890,9 @@ async def cli_addpdf(args):
                 except EOFError:  # move on to next question...
                     continue
                 if ans.strip():
-                    save_task = asyncio.create_task(
-                        article.register_pdf(ans, fmt, _g.ahSession))
-                    [done_task, ], _ = await asyncio.wait([save_task])
-                    if done_task.result() == _ret.SUCCESS:
+                    result = await article.register_pdf(ans, fmt,
+                                                        _g.ahSession)
+                    if result == _ret.SUCCESS:
                         yes += 1
                     else:
                         no += 1
@@ -954,6 +950,7 @@ async def cli_deletepdf(args):
             if fname.exists():
                 yes += 1
                 fname.unlink()
+    invalidate_listings()
     print(f"deletepdf: {yes} files deleted")
     return _ret.SUCCESS
 
@@ -1023,11 +1020,23 @@ async def cli_fetch(args):
             # Now they should all be done, so we can retrieve the results.
             urls = [task.result() for task in tasks]
 
-        for article, url in zip(articles_to_fetch, urls):
-            if url == _ret.FAILURE:
-                no += 1
-            else:
-                x = await article.register_pdf(url, "pdf", _g.ahSession)
+        # Download the PDFs concurrently, too, but not too many at a time.
+        jobs = [(article, url) for article, url in zip(articles_to_fetch, urls)
+                if url != _ret.FAILURE]
+        no += len(urls) - len(jobs)
+        if jobs:
+            semaphore = asyncio.Semaphore(_g.ahMaxDownloads)
+            async with Spinner(message="Downloading PDFs...",
+                               total=len(jobs)) as spinner:
+                async def download(article, url):
+                    async with semaphore:
+                        x = await article.register_pdf(url, "pdf",
+                                                       _g.ahSession, spinner)
+                    spinner.increment(1)
+                    return x
+                results = await asyncio.gather(*(download(article, url)
+                                                 for article, url in jobs))
+            for x in results:
                 if x == _ret.FAILURE:
                     no += 1
                 else:
@@ -1080,7 +1089,7 @@ def parse_refnos(args):
 
     Returns:
         If successfully parsed, returns a list of reference numbers as
-        integers.
+        integers, in ascending order.
 
     Raises:
         ArgumentError if the input was invalid in any way.
@@ -1092,14 +1101,14 @@ def parse_refnos(args):
     strs = s.split(",")
     # The easy way out
     if strs == ["all"]:
-        return set(range(1, len(_g.articleList) + 1))
+        return list(range(1, len(_g.articleList) + 1))
     elif strs == ["last"] or strs == ["latest"]:
         # Get the index of the most recently opened article.
         # t is the (refno, article) tuple generated by enumerate(), and
         # t[1] is the article dictionary.
         argmax, _ = max(enumerate(_g.articleList, start=1),
                         key=lambda t: t[1].time_opened)
-        return {argmax}
+        return [argmax]
     # Otherwise we've got to parse it.
     refnos = set()   # to avoid duplicates
     try:
@@ -1113,8 +1122,7 @@ def parse_refnos(args):
                 rmax = int(rmax)
                 if rmin >= rmax:
                     return _ret.FAILURE
-                for m in range(rmin, rmax + 1):
-                    refnos.add(m)
+                refnos.update(range(rmin, rmax + 1))
             else:
                 refnos.add(int(i))          # ValueError if not castable to int
     except (ValueError, TypeError):
@@ -1127,7 +1135,7 @@ def parse_refnos(args):
         if r > len(_g.articleList):
             raise ArgumentError(f"no article with refno {r}")
 
-    return list(refnos)
+    return sorted(refnos)
 
 
 def parse_formats(args, abbrevs=None):
@@ -5,24 +5,482 @@ cygcls.py
 Contains the Article, DOI, and Spinner classes.
 """
 
+import os
 import re
+import mmap
 import sys
-import subprocess
 import asyncio
 import urllib
 import shutil
 from pathlib import Path
+from time import time
 from unicodedata import normalize
-from operator import attrgetter
 from itertools import cycle
 
 import aiohttp
 from unidecode import unidecode
+# orjson parses JSON several times faster than the standard library, so use it
+# if it's available.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+from json import dumps as json_dumps
 
 from ._shared import *
 
 
+# A note on performance: everything here is string, dict, and network work.
+# The way to speed it up is to lean on the C-level string machinery (re,
+# str.translate, str.join, ...), as the code below does. Don't wrap any of it
+# in numba.jit or similar: numba only handles this kind of code in object
+# mode, which is slower than the plain interpreter.
+
+# Matches Greek letters spelt out in ACS titles, e.g. ".alpha.".
+_greek_regex = re.compile(r"\.(" + "|".join(_g.greek2Unicode) + r")\.")
+
+# Matches a full stop in a given name, along with the space after it (if any).
+_initial_dot_regex = re.compile(r"\. ?")
+
+# Matches each part of a given name (parts are separated by spaces or hyphens),
+# capturing its first letter.
+_name_part_regex = re.compile(r"([^\s-])[^\s-]*")
+
+# Acronyms used to shorten journal names in the list, and a regex matching any
+# of them. See Article.format_short_journalname().
+_journal_abbrevs = {
+    "Nucl Magn Reson": "NMR",
+}
+_journal_abbrev_regex = re.compile("|".join(re.escape(long)
+                                            for long in _journal_abbrevs))
+# Characters removed from journal names before the acronyms are applied.
+_journal_strip_table = str.maketrans("", "", ".")
+# Everything that isn't part of a journal's initials.
+_non_initial_regex = re.compile(r"[^A-Z]")
+
+# Templates for the citation types in Article.to_citation(), keyed by the type
+# and whether the article has an issue number. The long forms of each type
+# (e.g. "Rst") have _citation_long_prefix prepended.
+_citation_templates = {
+    ("rst", True): ("*{journal}* **{year},** *{volume}* ({issue}), {pages}. "
+                    "`DOI: {doi} <{doi_url}>`_"),
+    ("rst", False): ("*{journal}* **{year},** *{volume},* {pages}. "
+                     "`DOI: {doi} <{doi_url}>`_"),
+    ("markdown", True): ("*{journal}* **{year},** *{volume}* ({issue}), "
+                         "{pages}. [DOI: {doi}]({doi_url})"),
+    ("markdown", False): ("*{journal}* **{year},** *{volume},* {pages}. "
+                          "[DOI: {doi}]({doi_url})"),
+    ("word", True): "{journal} {year}, {volume} ({issue}), {pages}.",
+    ("word", False): "{journal} {year}, {volume}, {pages}.",
+}
+_citation_long_prefix = "{authors} {title}. "
+
+# Used by DOI.to_full_pdf_url() to figure out which publisher a DOI belongs
+# to. For each publisher, the first item is the regex to match against the
+# landing page, and the second item is the string to check the matched group
+# for. These are bytes, so that the page doesn't have to be decoded.
+_publisher_regexes = {
+    'wiley': [re.compile(rb"""<meta name=["']citation_publisher["']\s+content=["'](.+?)["']\s*/?>"""),
+              b"John Wiley"],
+    'elsevier': [re.compile(rb"""<input type="hidden" name="redirectURL" value="https%3A%2F%2Fwww.sciencedirect.com%2Fscience%2Farticle%2Fpii%2F(.+?)%3Fvia%253Dihub" id="redirectURL"/>"""),
+                 b""],
+    'tandf': [re.compile(rb"""<meta name=["']dc.Publisher["']\s+content=["'](.+?)["']\s*/?>"""),
+              b"Taylor"],
+    'annrev': [re.compile(rb"""<meta name=["']dc.Publisher["']\s+content=["'](.+?)["']\s*/?>"""),
+               b"Annual Reviews"],
+    'rsc': [re.compile(rb"""<meta content=["']https://pubs.rsc.org/en/content/articlepdf/(.+?)["']\s+name="citation_pdf_url"\s*/>"""),
+            b""],
+}
+# Matches wherever any of the regexes above would. Almost every line of a
+# landing page matches none of them, and this rules them out in one pass.
+_publisher_any_regex = re.compile(b"|".join(
+    b"(?:" + pattern + b")"
+    for pattern in dict.fromkeys(regex.pattern
+                                 for regex, _ in _publisher_regexes.values())))
+# The same table flattened for the line loop, with the bound search methods
+# looked up once here rather than once per line.
+_publisher_searches = tuple((pname, regex.search, keyword)
+                            for pname, (regex, keyword)
+                            in _publisher_regexes.items())
+# The <meta> tags can only be in the <head> of the page. Once that is over,
+# only Elsevier's redirect (a hidden <input>) is left to look for.
+_publisher_body_searches = tuple(entry for entry in _publisher_searches
+                                 if entry[0] == "elsevier")
+_publisher_body_prefilter = _publisher_regexes["elsevier"][0].search
+# Where each publisher keeps its full PDFs.
+_publisher_pdf_urls = {
+    "acs": "https://pubs.acs.org/doi/pdf/{}",
+    "wiley": "https://onlinelibrary.wiley.com/doi/pdfdirect/{}",
+    "elsevier": "https://www.sciencedirect.com/science/article/pii/{}/pdfft",
+    "nature": "https://www.nature.com/articles/{}.pdf",
+    "science": "https://science.sciencemag.org/content/sci/{}.full.pdf",
+    "springer": "https://link.springer.com/content/pdf/{}.pdf",
+    "tandf": "https://www.tandfonline.com/doi/pdf/{}",
+    "annrev": "https://www.annualreviews.org/doi/pdf/{}",
+    "rsc": "https://pubs.rsc.org/en/content/articlepdf/{}",
+}
+# Detects where Elsevier is redirecting us to, in Article.register_pdf().
+_elsevier_redirect_regex = re.compile(rb"""window.location\s*=\s*'(https?://.+)';""")
+
+
+class _PublisherFound(Exception):
+    pass
+
+
+# Characters which strings(1) counts as text, and a regex for anything else.
+_printable = frozenset(b"\t" + bytes(range(0x20, 0x7f)))
+_unprintable_regex = re.compile(rb"[^\t\x20-\x7e]")
+# How much of a PDF _doi_lines() copies at once.
+_scan_chunk_size = 2 ** 20
+
+
+def _doi_lines(data):
+    """
+    Yields the lines of text in a PDF (given as bytes, or an mmap) which
+    mention "doi", i.e. what `strings | grep -i doi` would print. Used by
+    DOI.from_pdf().
+    """
+    # Instead of going through every run of text in the file, which is slow
+    # in Python, we jump straight to each "doi" and find the text around it.
+    # Searching case-insensitively is much faster on a lowercased copy, but
+    # we only make copies of one chunk of the file at a time. The chunks
+    # overlap by two bytes so that a "doi" straddling two chunks isn't missed.
+    end = 0   # the end of the last line found
+    for offset in range(0, len(data), _scan_chunk_size):
+        lowered = data[offset:offset + _scan_chunk_size + 2].lower()
+        i = lowered.find(b"doi", max(end - offset, 0))
+        while i != -1:
+            start = i = offset + i
+            while start > 0 and data[start - 1] in _printable:
+                start -= 1
+            match = _unprintable_regex.search(data, i)
+            end = match.start() if match else len(data)
+            if end - start >= 4:   # strings(1) ignores anything shorter
+                yield data[start:end].decode(_g.gpe)
+            i = lowered.find(b"doi", end - offset)
+
+
+# Used by DOI.from_pdf() to pick out the DOI from the text in a PDF. The
+# regexes are tried in order, so the more reliable ones come first.
+_pdf_doi_regexes = [re.compile(regex) for regex in [
+    r"""<prism:doi>(10.\d{4,9}/[-._;()/:a-zA-Z0-9]+)</prism:doi>""",
+    r"""["'](?:doi|DOI):(10.\d{4,9}/[-._;()/:a-zA-Z0-9]+)["']""",
+    r"""URI\s*\(https?://doi.org/(10.\d{4,9}/[-._;()/:a-zA-Z0-9]+)\)\s*>""",
+    r"""URI\s*\((?:https?://)?www.nature.com/doifinder/(10.\d{4,9}/[-._;()/:a-zA-Z0-9]+)\)\s*>""",
+    # This one works for some ACIE papers, but is too risky. It matches
+    # against DOIs of cited papers too. Better to use WPS-ARTICLEDOI.
+    # r"""/URI\(https?://(?:dx)?.doi.org/(10.\d{4,9}/[-._;()/:a-zA-Z0-9]+)\)""",
+    r"""/WPS-ARTICLEDOI\s*\((10.\d{4,9}/[-._;()/:a-zA-Z0-9]+)\)""",
+    r"""\((?:doi|DOI):\s*(10.\d{4,9}/[-._;()/:a-zA-Z0-9]+)\)""",
+    r"""<rdf:li.+>(?:doi|DOI):(10.\d{4,9}/[-._;()/:a-zA-Z0-9]+)</rdf:li>""",
+]]
+# Matches wherever any of the regexes above would. Most lines don't contain a
+# DOI at all, and this rules them out in one pass instead of seven.
+_pdf_doi_any_regex = re.compile("|".join(f"(?:{regex.pattern})"
+                                         for regex in _pdf_doi_regexes))
+
+
+class _DOIFound(Exception):
+    pass
+
+
+# Listings of the pdf and si folders, used to check whether PDFs are available
+# without having to stat() every single file. Maps each folder to a tuple of
+# (mtime of folder, frozenset of filenames in folder). Since the mtime changes
+# whenever a file is added or removed, a stale listing is never used.
+_listings = {}
+
+
+def get_listing(folder):
+    """
+    Returns a frozenset of the names of the files in the given folder (which
+    is empty if the folder does not exist). The folder is only read if it has
+    changed since the last time this was called.
+    """
+    try:
+        mtime = folder.stat().st_mtime_ns
+    except FileNotFoundError:
+        return frozenset()
+    cached = _listings.get(folder)
+    if cached is None or cached[0] != mtime:
+        with os.scandir(folder) as entries:
+            names = frozenset(e.name for e in entries if e.is_file())
+        cached = _listings[folder] = (mtime, names)
+    return cached[1]
+
+
+def get_listings():
+    """
+    Returns a tuple of the listings of the pdf and si folders in
+    _g.currentPath, in the same form as get_listing(). Functions which check
+    many Articles at once can call this once and pass the result to
+    Article.get_availability().
+    """
+    return (get_listing(_g.currentPath / "pdf"),
+            get_listing(_g.currentPath / "si"))
+
+
+def invalidate_listings():
+    """
+    Discards all cached folder listings. Should be called after adding or
+    removing PDFs, in case the folder mtime has too coarse a resolution to
+    reflect the change.
+    """
+    _listings.clear()
+
+
+def _is_local(path):
+    """
+    Checks whether a path passed to Article.register_pdf() refers to a file on
+    disk (as opposed to a URL).
+    """
+    return isinstance(path, Path) or "://" not in str(path)
+
+
+def get_session(client_session=None):
+    """
+    Picks the aiohttp.ClientSession to use for a request. In order of
+    preference, this is the one that was passed in, the long-lived one opened
+    by main_coro() (so that its connections can be kept alive across
+    lookups), or a new one.
+
+    Returns a tuple (session, owned). If owned is True, the session was
+    created just for this call, and the caller is responsible for closing it.
+    """
+    if client_session is not None:
+        return client_session, False
+    if _g.ahSession is not None and not _g.ahSession.closed:
+        return _g.ahSession, False
+    # Make sure we have a polite header, though. The session might be used for
+    # a whole batch of lookups (e.g. DOI.to_articles()), so its connector is
+    # set up just like the main session's.
+    connector = aiohttp.TCPConnector(**_g.ahConnectorOptions)
+    return aiohttp.ClientSession(headers=_g.httpHeaders,
+                                 connector=connector,
+                                 timeout=_g.ahTimeout,
+                                 read_bufsize=_g.ahReadBufsize), True
+
+
+def _crossref_cache_path(doi):
+    """
+    Returns the path where the Crossref response for a DOI is cached. DOIs are
+    case-insensitive, so the file name is lowercased.
+    """
+    return _g.crossrefCacheDir / (doi.lower().replace("/", "#") + ".json")
+
+
+def _crossref_cache_get(doi):
+    """
+    Returns the cached Crossref response (as bytes) for a DOI, or None if there
+    isn't one, or if it is too old.
+    """
+    path = _crossref_cache_path(doi)
+    try:
+        if time() - path.stat().st_mtime > _g.crossrefCacheAge:
+            return None
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _write_cache_file(path, data):
+    """
+    Writes bytes to a file in the cache. Failing to do so isn't an error; the
+    information will just be looked up again next time.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first, so that a half-written file is
+        # never read back.
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _crossref_cache_put(doi, data):
+    """
+    Saves a Crossref response (as bytes) for a DOI to the cache.
+    """
+    _write_cache_file(_crossref_cache_path(doi), data)
+
+
+async def _crossref_get(session, url):
+    """
+    Makes a request to the Crossref API. Returns the body of the response as
+    bytes, or None if the request failed (e.g. because the DOI wasn't found).
+    """
+    try:
+        async with session.get(url) as resp:
+            if resp.status != 200:
+                return None
+            return await resp.read()
+    except aiohttp.client_exceptions.ClientResponseError:
+        return None
+
+
+# Registration agency (e.g. "crossref" or "datacite") of each DOI prefix that
+# has been checked. Crossref only has metadata for its own DOIs, so there's no
+# point asking it about DOIs with a prefix that belongs to another agency.
+# This is read from _g.doiAgencyFile when first needed.
+_doi_agencies = None
+
+
+def _get_doi_agencies():
+    """
+    Returns the dictionary of known DOI prefixes and their agencies.
+    """
+    global _doi_agencies
+    if _doi_agencies is None:
+        try:
+            _doi_agencies = json_loads(_g.doiAgencyFile.read_bytes())
+        except (OSError, ValueError):
+            _doi_agencies = {}
+    return _doi_agencies
+
+
+async def _learn_doi_agency(doi, session):
+    """
+    Asks Crossref which agency a DOI was registered with, and remembers the
+    answer for all DOIs with the same prefix. Nothing is remembered if there's
+    no answer (e.g. if the DOI doesn't exist).
+    """
+    prefix = doi.split("/", 1)[0]
+    agencies = _get_doi_agencies()
+    if prefix in agencies:
+        return
+    data = await _crossref_get(
+        session, f"https://api.crossref.org/works/{doi}/agency")
+    try:
+        agencies[prefix] = json_loads(data)["message"]["agency"]["id"]
+    except (TypeError, ValueError, KeyError):
+        return
+    _write_cache_file(_g.doiAgencyFile, json_dumps(agencies).encode())
+
+
+async def _stream_to_file(resp, dest, spinner=None):
+    """
+    Streams the body of an aiohttp response into the file dest. If a spinner
+    is given, it is incremented by the number of megabytes received.
+
+    If the download fails (or is cancelled) part of the way through, dest is
+    deleted again, so that a truncated PDF is never left in the database.
+    """
+    # The writes go to the default executor so that the event loop (and thus
+    # the socket, and the spinner) isn't held up by the disk.
+    loop = asyncio.get_running_loop()
+    mb = 2 ** 20   # bytes
+    # The spinner only redraws every 0.1 s anyway, so it is updated once per
+    # megabyte rather than once per chunk.
+    pending = 0
+    try:
+        with open(dest, "wb") as fp:
+            chunk_size = 2 ** 18   # bytes
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                await loop.run_in_executor(None, fp.write, chunk)
+                if spinner is not None:
+                    pending += len(chunk)
+                    if pending >= mb:
+                        spinner.increment(pending / mb)
+                        pending = 0
+    # BaseException, because CancelledError isn't an Exception from 3.8 on.
+    except BaseException:
+        try:
+            dest.unlink()
+        except OSError:
+            pass
+        raise
+    if spinner is not None and pending:
+        spinner.increment(pending / mb)
+
+
+def _nfkc(s):
+    """
+    Applies NFKC normalisation to a string. Most names from Crossref are plain
+    ASCII, which NFKC leaves unchanged, so these are returned straight away.
+    """
+    return s if s.isascii() else normalize("NFKC", s)
+
+
+def _space_initials(given):
+    """
+    Converts given names such as 'J.R.J.' to 'J. R. J.'.
+    """
+    if "." in given:
+        given = _initial_dot_regex.sub(". ", given)
+    return given.rstrip()
+
+
+def _given_names(author):
+    """
+    Returns the given names of an author from Crossref, cleaned up, or None
+    if there aren't any.
+    """
+    # We should probably try to handle the no family name case, but I'm not
+    # sure when we will actually come across an example...
+    if "given" not in author or author["given"] == []:
+        return None
+    # deal with a pathological case, 10.1016/j.jmr.2018.02.009
+    ns = author["given"].split()
+    for i, name in enumerate(ns):
+        if i >= 1 and name.startswith('-'):
+            this_name = ns.pop(i)
+            ns[i - 1] += this_name
+    return " ".join(ns)
+
+
+def _format_author_display(author):
+    # "Jean-Baptiste Simon" -> "JBS"
+    given_names = _given_names(author)
+    if given_names is None:
+        return author["family"]
+    return ("".join(_name_part_regex.findall(given_names))
+            + " " + author["family"])
+
+
+def _format_author_acs(author):
+    # "Jean-Baptiste Simon" -> "J.-B. S."
+    given_names = _given_names(author)
+    if given_names is None:
+        return author["family"]
+    return author["family"] + ", " + _name_part_regex.sub(r"\1.", given_names)
+
+
+def _format_author_bib(author):
+    given_names = _given_names(author)
+    if given_names is None:
+        return author["family"]
+    s = author["family"] + ", " + given_names
+    return s.replace(". ", ".\\ ")  # Must use control spaces
+
+
+def _format_author_full(author):
+    given_names = _given_names(author)
+    if given_names is None:
+        return author["family"]
+    return given_names + " " + author["family"]
+
+
+# Article.format_authors() looks up the formatter once for the whole list,
+# instead of checking the style again for every author.
+_author_formatters = {"display": _format_author_display,
+                      "acs": _format_author_acs,
+                      "bib": _format_author_bib,
+                      "full": _format_author_full}
+
+
 class Article():
+    # The metadata fields of an Article, i.e. everything which is serialised.
+    fields = ("title", "authors", "journal_long", "journal_short", "year",
+              "volume", "issue", "pages", "doi", "time_added", "time_opened")
+    # There are a lot of Articles, so we don't give them a __dict__.
+    __slots__ = fields + ("_fname_cache", "_authors_cache", "_journal_cache",
+                          "_doi_url_cache")
+    # The fields shown by diff(), and the width to print their names in.
+    diff_fields = sorted(set(fields) - {"time_added", "time_opened"})
+    diff_width = max(len(field) for field in diff_fields)
+
     def __init__(self, title=None, authors=None,
                  journal_long=None, journal_short=None,
                  year=None, volume=None, issue=None,
@@ -39,21 +497,34 @@ class Article():
         self.doi = doi
         self.time_added = time_added
         self.time_opened = time_opened
+        # Caches for to_fname(), format_authors(), and
+        # format_short_journalname(). See there for details.
+        self._fname_cache = None
+        self._authors_cache = None
+        self._journal_cache = None
+        self._doi_url_cache = None
+
+    def to_dict(self):
+        """
+        Returns a dictionary of the metadata fields of the article, suitable
+        for serialisation. Article(**article.to_dict()) gives back an equal
+        Article.
+        """
+        return {field: getattr(self, field) for field in self.fields}
+
+    def _key(self):
+        """
+        Returns a tuple of all the attributes that are compared in __eq__,
+        i.e. everything except for time_added and time_opened.
+        """
+        return (self.title, self.authors, self.journal_long,
+                self.journal_short, self.year, self.volume, self.issue,
+                self.pages, self.doi)
 
     def __eq__(self, other):
         if not isinstance(other, Article):
             return NotImplemented
-        # Compare attributes one by one, except for time_added and time_opened
-        return (self.title == other.title
-                and self.authors == other.authors
-                and self.journal_long == other.journal_long
-                and self.journal_short == other.journal_short
-                and self.journal_short == other.journal_short
-                and self.year == other.year
-                and self.volume == other.volume
-                and self.issue == other.issue
-                and self.pages == other.pages
-                and self.doi == other.doi)
+        return self._key() == other._key()
 
     def format_authors(self, style):
         """
@@ -63,7 +534,7 @@ class Article():
         ----------
         style : str
             Style in which the output should be produced. Must be one of
-            "display", "acs", or "bib". The output is as follows:
+            "display", "acs", "bib", or "full". The output is as follows:
                  - "display": "JRJ Yong"
                  - "acs"    : "Yong, J. R. J."
                  - "bib"    : "Yong, Jonathan R. J."
@@ -73,49 +544,29 @@ class Article():
         -------
         A list of appropriately formatted strings, one for each author, or None
         if self.authors is None.
-        """
-        def format_one_author(author, style):
-            """
-            Helper function that does it for one author.
-            """
-            # Check If there's no given name.
-            # We should probably try to handle the no family name case, but
-            # I'm not sure when we will actually come across an example...
-            if "given" not in author or author["given"] == []:
-                return author["family"]
-            # Otherwise...
-            family_name = author["family"]
-            given_names = author["given"]
-
-            # deal with a pathological case, 10.1016/j.jmr.2018.02.009
-            ns = given_names.split()
-            for i, name in enumerate(ns):
-                if i >= 1 and name.startswith('-'):
-                    this_name = ns.pop(i)
-                    ns[i - 1] += this_name
-            given_names = " ".join(ns)
-
-            if style == "display":
-                return ("".join(n[0] for n in re.split(r"[\s-]", given_names))
-                        + " " + family_name)
-            elif style == "acs":
-                # "Jean-Baptiste Simon" -> [["Jean", "Baptiste"], ["Simon"]]
-                split_both = [name.split('-') for name in given_names.split()]
-                # [["Jean", "Baptiste"], ["Simon"]] -> "J.-B. S"
-                joined_both = ". ".join([".-".join(n[0] for n in names)][0]
-                                         for names in split_both)
-                return (family_name + ", " + joined_both + ".")
-            elif style == "bib":
-                s = family_name + ", " + given_names
-                return s.replace(". ", ".\\ ")  # Must use control spaces
-            elif style == "full":
-                return given_names + " " + family_name
-            # Otherwise, grumble.
-            else:
-                raise ValueError(f"Invalid value '{style}' for style.")
 
-        if self.authors is not None:
-            return [format_one_author(author, style) for author in self.authors]
+        Raises
+        ------
+        ValueError
+            If an invalid style is given.
+        """
+        try:
+            format_one_author = _author_formatters[style]
+        except KeyError:
+            raise ValueError(f"Invalid value '{style}' for style.") from None
+        if self.authors is None:
+            return None
+        # The formatted names are needed every time the list is printed or a
+        # citation is made, so we cache them for each style. The cache
+        # remembers which list of authors it was built from, so that it is
+        # rebuilt if self.authors is replaced.
+        cache = self._authors_cache
+        if cache is None or cache[0] is not self.authors:
+            cache = self._authors_cache = (self.authors, {})
+        if style not in cache[1]:
+            cache[1][style] = [format_one_author(author)
+                               for author in self.authors]
+        return list(cache[1][style])
 
     def format_short_journalname(self):
         """
@@ -127,13 +578,15 @@ class Article():
         -------
         A string with the shortest possible form.
         """
-        abbrevs = {
-            "Nucl Magn Reson": "NMR",
-        }
-
-        name = self.journal_short.replace(".", "")
-        for long, short in abbrevs.items():
-            name = name.replace(long, short)
+        # Cached in the same way as format_authors().
+        cache = self._journal_cache
+        if cache is not None and cache[0] is self.journal_short:
+            return cache[1]
+
+        name = _journal_abbrev_regex.sub(
+            lambda m: _journal_abbrevs[m.group()],
+            self.journal_short.translate(_journal_strip_table))
+        self._journal_cache = (self.journal_short, name)
         return name
 
     def get_volume_info(self):
@@ -151,26 +604,42 @@ class Article():
         else:
             return f"{self.volume}, {self.pages}"
 
-    def get_availability(self):
+    def get_availability(self, listings=None):
         """
         Checks whether the PDF and SI are available for a given article.
 
+        Parameters
+        ----------
+        listings : tuple of (frozenset, frozenset), optional
+            The output of get_listings(), if the caller already has it. This
+            avoids checking the folders again for every Article.
+
         Returns
         -------
         List of (bool, bool) corresponding to PDF and SI availability.
         """
-        return [self.to_fname(type).is_file() for type in ("pdf", "si")]
+        if listings is None:
+            listings = get_listings()
+        paths = [self.to_fname(type) for type in ("pdf", "si")]
+        return [p.name in listing for p, listing in zip(paths, listings)]
 
-    def get_availability_string(self):
+    def get_availability_string(self, availability=None):
         """
         Generates a string reflecting the presence or absence of a PDF or SI
         for a given article.
 
+        Parameters
+        ----------
+        availability : list of (bool, bool), optional
+            The output of get_availability(), if the caller already has it.
+            This avoids checking the file system twice.
+
         Returns
         -------
         A string with a green tick / red cross for 'pdf' and 'si' formats.
         """
-        exists = self.get_availability()
+        exists = (self.get_availability() if availability is None
+                  else availability)
         symbols = ['\u2714' if e else '\u2718' for e in exists]
         colors = [_g.ansiDiffGreen if e else _g.ansiDiffRed for e in exists]
         return (f"{colors[0]}{symbols[0]}{_g.ansiReset}pdf  "
@@ -191,14 +660,27 @@ class Article():
         -------
         The filename as a pathlib.Path object, or URL as a string.
         """
-        if type in ["pdf", "p"]:
-            return _g.currentPath / "pdf" / f"{self.doi.replace('/','#')}.pdf"
-        elif type in ["si", "s"]:
-            return _g.currentPath / "si" / f"{self.doi.replace('/','#')}.pdf"
-        elif type in ["web", "w"]:
+        if type in ["web", "w"]:
             return f"https://doi.org/{self.doi}"
-        else:
-            raise ValueError("Invalid type '{type}' given")
+        elif type not in ["pdf", "p", "si", "s"]:
+            raise ValueError(f"Invalid type '{type}' given")
+
+        # This gets called for every article whenever the list is printed, so
+        # we cache the paths. The cache remembers which DOI and which
+        # _g.currentPath it was built from, so that it is rebuilt if either of
+        # them changes. The filename itself only depends on the DOI, so it is
+        # kept when only _g.currentPath changes.
+        cache = self._fname_cache
+        if cache is None or cache[0] is not self.doi:
+            fname = f"{self.doi.replace('/','#')}.pdf"
+            cache = (self.doi, fname, None, None, None)
+        if cache[2] is not _g.currentPath:
+            fname = cache[1]
+            cache = (self.doi, fname, _g.currentPath,
+                     _g.currentPath / "pdf" / fname,
+                     _g.currentPath / "si" / fname)
+            self._fname_cache = cache
+        return cache[3] if type in ["pdf", "p"] else cache[4]
 
     def to_citation(self, type):
         """
@@ -215,51 +697,37 @@ class Article():
         -------
         The citation as a string.
         """
-        acs_authors = "; ".join(self.format_authors("acs"))
-        # Some articles don't come with pages. :-(
-        pages_with_endash = (self.pages.replace("-", "\u2013") if self.pages
-                             else "")
-        # Actually, not using quote() generally gives results that work fine.
-        # The only issue is that when using Markdown URLs with parentheses in
-        # Jupyter notebooks, the conversion to HTML gets it wrong, thinking
-        # that the URL ends at the first close parentheses in the URL. (In
-        # the notebook itself, it is fine, only the conversion to HTML messes
-        # up.) So we might as well escape them generally.
-        doi_url = f"https://doi.org/{urllib.parse.quote(self.doi)}"
-
         # BibLaTeX
         if type in ["bib", "b"]:
             # Create (hopefully) unique identifier
             author_decoded = unidecode(self.authors[0]["family"])
-            journal_initials = "".join(c for c in self.journal_short
-                                       if c.isupper())
+            journal_initials = _non_initial_regex.sub("", self.journal_short)
             ref_identifier = f"{author_decoded}{self.year}{journal_initials}"
             ref_identifier = "".join(ref_identifier.split())  # remove spaces
             # Author names in bib style
             author_names = " and ".join(self.format_authors("bib"))
             journal = self.journal_short.replace(". ", ".\\ ")
-            # Open and close braces
-            # Truthfully we don't need this. However, including the doubled
-            # curly braces in the f-string makes vim's indentation go crazy.
-            open, close = "{", "}"
-            # Make the citation
-            s = (f"@article{open}{ref_identifier},\n"
-                 f"    doi = {{{self.doi}}},\n"
-                 f"    author = {{{author_names}}},\n"
-                 f"    journal = {{{journal}}},\n"
-                 f"    title = {{{self.title}}},\n"
-                 f"    year = {{{self.year}}},\n")
+            # Make the citation, one line at a time
+            fields = [("doi", self.doi),
+                      ("author", author_names),
+                      ("journal", journal),
+                      ("title", self.title),
+                      ("year", self.year)]
             if self.volume is not None:
-                s += f"    volume = {{{self.volume}}},\n"
+                fields.append(("volume", self.volume))
             if self.issue is not None:
-                s += f"    issue = {{{self.issue}}},\n"
+                fields.append(("issue", self.issue))
             if self.pages is not None:
-                s += f"    pages = {{{self.pages.replace('-', '--')}}},\n"
-            s += close
+                fields.append(("pages", self.pages.replace('-', '--')))
+            lines = [f"@article{{{ref_identifier},"]
+            lines.extend(f"    {key} = {{{value}}}," for key, value in fields)
+            lines.append("}")
+            s = "\n".join(lines)
             # Replace Unicode characters with their LaTeX equivalents
-            for char in _g.unicodeLatexDict:
-                s = s.replace(char, _g.unicodeLatexDict[char])
-            return s
+            if _g.unicodeLatexRegex is not None:
+                s = _g.unicodeLatexRegex.sub(
+                    lambda m: _g.unicodeLatexDict[m.group()], s)
+            return s.translate(_g.unicodeLatexTable)
 
         # Just DOI
         if type in ["doi", "d"]:
@@ -271,41 +739,46 @@ class Article():
         if type[0].upper() == type[0]:
             long = True
             type = type.lower()
-
-        # reStructuredText
-        if type in ["rst", "r"]:
-            author_title = f"{acs_authors} {self.title}. " if long else ""
-            vol_issue = (f"*{self.volume}* ({self.issue}), " if self.issue
-                         else f"*{self.volume},* ")
-            return (author_title
-                    + f"*{self.journal_short}* **{self.year},** "
-                    + vol_issue
-                    + f"{pages_with_endash}. "
-                    + f"`DOI: {self.doi} <{doi_url}>`_")
-
-        # Markdown
-        if type in ["markdown", "m"]:
-            author_title = f"{acs_authors} {self.title}. " if long else ""
-            vol_issue = (f"*{self.volume}* ({self.issue}), " if self.issue
-                         else f"*{self.volume},* ")
-            return (author_title
-                    + f"*{self.journal_short}* **{self.year},** "
-                    + vol_issue
-                    + f"{pages_with_endash}. "
-                    + f"[DOI: {self.doi}]({doi_url})")
-
-        # Word
-        elif type in ["word", "w"]:
-            author_title = f"{acs_authors} {self.title}. " if long else ""
-            vol_issue = (f"{self.volume} ({self.issue}), " if self.issue
-                         else f"{self.volume}, ")
-            return (author_title
-                    + f"{self.journal_short} {self.year}, "
-                    + vol_issue
-                    + f"{pages_with_endash}.")
-
+        type = {"r": "rst", "m": "markdown", "w": "word"}.get(type, type)
+        if type not in ["rst", "markdown", "word"]:
+            raise ValueError(f"Invalid citation type '{type}' given")
+
+        template = _citation_templates[type, bool(self.issue)]
+        # Only the long forms need the authors.
+        if long:
+            template = _citation_long_prefix + template
+            acs_authors = "; ".join(self.format_authors("acs"))
+        else:
+            acs_authors = ""
+        # Only rst and Markdown link to the DOI.
+        if type == "word":
+            doi_url = ""
         else:
-            raise ValueError("Invalid citation type '{type}' given")
+            # Actually, not using quote() generally gives results that work
+            # fine. The only issue is that when using Markdown URLs with
+            # parentheses in Jupyter notebooks, the conversion to HTML gets it
+            # wrong, thinking that the URL ends at the first close parentheses
+            # in the URL. (In the notebook itself, it is fine, only the
+            # conversion to HTML messes up.) So we might as well escape them
+            # generally. Cached in the same way as format_authors().
+            cache = self._doi_url_cache
+            if cache is None or cache[0] is not self.doi:
+                cache = (self.doi,
+                         f"https://doi.org/{urllib.parse.quote(self.doi)}")
+                self._doi_url_cache = cache
+            doi_url = cache[1]
+        # Some articles don't come with pages. :-(
+        pages_with_endash = (self.pages.replace("-", "\u2013") if self.pages
+                             else "")
+        return template.format(authors=acs_authors,
+                               title=self.title,
+                               journal=self.journal_short,
+                               year=self.year,
+                               volume=self.volume,
+                               issue=self.issue,
+                               pages=pages_with_endash,
+                               doi=self.doi,
+                               doi_url=doi_url)
 
     def diff(self, other):
         """
@@ -331,11 +804,10 @@ class Article():
             return 0
 
         # Compare all attributes except for time added and opened
-        attribs = sorted(set(vars(self)) - {"time_added", "time_opened"})
-        # Get field width (for pretty printing)
-        maxlen = max(len(attrib) for attrib in attribs)
+        maxlen = self.diff_width
+        red, green, reset = _g.ansiDiffRed, _g.ansiDiffGreen, _g.ansiReset
         # Check individual keys
-        for attrib in attribs:
+        for attrib in self.diff_fields:
             # We need to convert authors to a string
             if attrib == "authors":
                 if self.authors is not None:
@@ -346,22 +818,20 @@ class Article():
                     new_value = ", ".join(other.format_authors("full"))
                 else:
                     new_value = None
-            # Other attributes can be accessed via the dict
+            # Other attributes can be accessed directly
             else:
-                old_value = attrgetter(attrib)(self)
-                new_value = attrgetter(attrib)(other)
+                old_value = getattr(self, attrib)
+                new_value = getattr(other, attrib)
             # Compare them
             if old_value is not None and old_value == new_value:
                 print(f"{attrib:>{maxlen}}: {old_value}")
             else:
                 ndiffs += 1
                 if old_value is not None:
-                    print(f"{attrib:>{maxlen}}: "
-                          f"{_g.ansiDiffRed}- {old_value}{_g.ansiReset}")
+                    print(f"{attrib:>{maxlen}}: {red}- {old_value}{reset}")
                     attrib = ""  # avoid printing the attribute name twice
                 if new_value is not None:
-                    print(f"{attrib:>{maxlen}}: "
-                          f"{_g.ansiDiffGreen}+ {new_value}{_g.ansiReset}")
+                    print(f"{attrib:>{maxlen}}: {green}+ {new_value}{reset}")
         return ndiffs
 
     def to_newarticle(self):
@@ -369,17 +839,20 @@ class Article():
         Fetches a new set of metadata from Crossref. Returns a new Article
         instance.
 
-        It's just a wrapper around the DOI method.
+        It's just a wrapper around the DOI method. The Crossref cache is not
+        used, since the point is to get the latest metadata.
         """
-        return DOI(self.doi).to_article(metadata=True)
+        return DOI(self.doi).to_article(metadata=True, use_cache=False)
 
     async def to_newarticle_cr(self, client_session=None):
         """
         Asynchronous version of fetch_metadata().
         """
-        return await DOI(self.doi).to_article_cr(client_session=client_session)
+        return await DOI(self.doi).to_article_cr(client_session=client_session,
+                                                 use_cache=False)
 
-    async def register_pdf(self, path, type, client_session=None):
+    async def register_pdf(self, path, type, client_session=None,
+                           spinner=None):
         """
         Copies a PDF for an article into the database ('registering' it).
 
@@ -389,102 +862,128 @@ class Article():
             Link to the file, or to a webpage.
         type : str from {"pdf", "si"}
             Indicates whether it's a PDF or SI.
+        client_session : aiohttp.ClientSession, optional
+            Session to download with. See get_session().
+        spinner : Spinner, optional
+            Set this when several PDFs are being downloaded at once, and the
+            caller is already showing their progress. The download then doesn't
+            get a spinner of its own (and the caller does the incrementing).
         """
-        # Figure out whether it's a file on disk, or a web page. This is crude,
-        # but should work as long as we only use absolute paths.
-        src_type = "file" if str(path).startswith('/') else "url"
+        # Figure out whether it's a file on disk, or a web page.
+        src_type = "file" if _is_local(path) else "url"
 
         # Construct the destination path (where the PDF should be saved to).
         pdest = self.to_fname(type)
         # mkdir -p the folder if it doesn't already exist.
-        if not pdest.parent.exists():
-            pdest.parent.mkdir(parents=True)
+        pdest.parent.mkdir(parents=True, exist_ok=True)
 
         # Copy a file over.
         if src_type == "file":
             # Process and check source path. Note that dragging-and-dropping
-            # into the terminal gives us escaped spaces, hence the replace().
-            psrc = str(path).replace("\\ "," ").strip()
-            for escapedChar, char in _g.pathEscapes:
-                psrc = psrc.replace(escapedChar, char)
-            psrc = Path(psrc)
+            # into the terminal gives us escaped characters, hence the
+            # replace(). Path objects don't need any of this.
+            if isinstance(path, Path):
+                psrc = path
+            else:
+                psrc = str(path).strip()
+                for escapedChar, char in _g.pathEscapes.items():
+                    psrc = psrc.replace(escapedChar, char)
+                psrc = Path(psrc)
             if not psrc.is_file():
                 return _error("The specified PDF was not found.")
-            else:
-                shutil.copy2(psrc, pdest)
+            # Nothing to do if it's already there (copyfile() would complain).
+            if pdest.exists() and psrc.samefile(pdest):
+                return _ret.SUCCESS
+            # copyfile() doesn't bother with the file's metadata, and lets the
+            # kernel do the copying where it can. It runs in the default
+            # executor so that big files don't block the event loop.
+            try:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, shutil.copyfile, psrc, pdest)
+            except OSError as e:
+                return _error(f"Could not copy '{psrc}' to '{pdest}': "
+                              f"{e.strerror}")
 
         # Downloading a file...
         if src_type == "url":
-            # Instantiate a new ClientSession if none was provided. However, we
-            # do need to remember whether the ClientSession was provided: if it
-            # wasn't, then we should close it at the end.
-            if client_session is None:
-                # Make sure we have a polite header, though.
-                session = aiohttp.ClientSession(headers=_g.httpHeaders)
-            else:
-                session = client_session
+            # Reuse an existing ClientSession if possible. However, we do need
+            # to remember whether we opened a new one: if so, then we should
+            # close it at the end.
+            session, owned = get_session(client_session)
 
             psrc = str(path).strip()
+            # Set if Elsevier redirects us.
+            newurl = None
             try:
                 async with session.get(psrc) as resp:
                     # Check if Elsevier is trying to redirect us.
                     if ("sciencedirect" in psrc
                             and resp.content_type == "text/html"):
-                        # Construct a regex which detects where it's
-                        # redirecting us to, then scan the website text for the
-                        # redirect URL.
-                        redirectRegex = re.compile(
-                            r"""window.location\s*=\s*'(https?://.+)';"""
-                        )
-                        text = await resp.text()
-                        for line in text.split("\n"):
-                            match = redirectRegex.search(line)
+                        # Scan the website for the redirect URL. The regex
+                        # can't match across lines, so the page can be read
+                        # line by line, stopping as soon as it turns up. The
+                        # URL is ASCII (resp.get_encoding() can't be used
+                        # here, as the body hasn't been read).
+                        async for line in resp.content:
+                            match = _elsevier_redirect_regex.search(line)
                             if match:
-                                newurl = match.group(1)
-                                _debug("Redirected by Elsevier")
-                                # We just need to recursively call ourself with
-                                # the new URL.
-                                new_save = asyncio.create_task(
-                                    self.register_pdf(newurl, type))
-                                await asyncio.wait([new_save])
-                                return new_save.result()
-                    # Otherwise, check if we are actually getting a PDF
-                    if "application/pdf" not in resp.content_type:
-                        return _error(f"The URL '{psrc}' was not a PDF file.")
-
-                    # OK, so by now we are pretty sure we have a working link
-                    # to a PDF. Try to get the file size.
-                    filesize = None
-                    try:
-                        filesize = int(resp.headers["content-length"])
-                    except (KeyError, ValueError):
-                        pass
-                    # Create spinner.
-                    total = filesize/(2 ** 20) if filesize else 0
-                    async with Spinner((f"Downloading PDF for "
-                                        f"'{self.title}'..."),
-                                       total=total,
-                                       units="MB", fstr="{:.2f}") as spinner:
-                        # Stream the content directly into pdest
-                        with open(pdest, "wb") as fp:
-                            chunk_size = 2048   # bytes
-                            while True:  # good argument for := here
-                                chunk = await resp.content.read(chunk_size)
-                                if not chunk:
-                                    break
-                                fp.write(chunk)
-                                if filesize is not None:
-                                    spinner.increment(chunk_size/(2**20))
+                                newurl = match.group(1).decode("ascii")
+                                break
+                    if newurl is None:
+                        # Otherwise, check if we are actually getting a PDF
+                        if "application/pdf" not in resp.content_type:
+                            return _error(f"The URL '{psrc}' was not a PDF "
+                                          f"file.")
+
+                        # OK, so by now we are pretty sure we have a working
+                        # link to a PDF. Stream the content directly into
+                        # pdest.
+                        if spinner is not None:
+                            await _stream_to_file(resp, pdest)
+                        else:
+                            # Try to get the file size.
+                            filesize = None
+                            try:
+                                filesize = int(resp.headers["content-length"])
+                            except (KeyError, ValueError):
+                                pass
+                            # Create spinner.
+                            total = filesize/(2 ** 20) if filesize else 0
+                            async with Spinner((f"Downloading PDF for "
+                                                f"'{self.title}'..."),
+                                               total=total,
+                                               units="MB",
+                                               fstr="{:.2f}") as sp:
+                                await _stream_to_file(
+                                    resp, pdest,
+                                    sp if filesize is not None else None)
+                # We just need to recursively call ourself with the new URL.
+                # This is done only after leaving the 'async with', so that
+                # the redirect page (and its connection) isn't held on to for
+                # the whole of the next download.
+                if newurl is not None:
+                    _debug("Redirected by Elsevier")
+                    return await self.register_pdf(
+                        newurl, type, client_session=session,
+                        spinner=spinner)
             except aiohttp.client_exceptions.InvalidURL:
                 return _error(f"Invalid URL {psrc} provided.")
             except aiohttp.ClientResponseError as e:
                 return _error(f"HTTP status {e.status}: {e.message}")
-
-            # Close off the ClientSession instance if it was only created for
-            # this.
-            if client_session is None:
-                await session.close()
-
+            # Anything else that goes wrong with the connection, e.g. the
+            # server disconnecting or the read timing out. Several downloads
+            # can be running at once (see cli_fetch()), so this mustn't be
+            # allowed to propagate.
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                return _error(f"Download from '{psrc}' failed: "
+                              f"{str(e) or type(e).__name__}")
+            finally:
+                # Close off the ClientSession instance if it was only created
+                # for this.
+                if owned:
+                    await session.close()
+
+        invalidate_listings()
         return _ret.SUCCESS
 
     def make_haystack(self):
@@ -495,7 +994,7 @@ class Article():
         journal_data = [" ".join(self.format_authors(style="full")),
                         self.journal_long,
                         self.journal_short,
-                        "".join(c for c in self.journal_short if c.isupper()),
+                        _non_initial_regex.sub("", self.journal_short),
                         self.title]
         return [unidecode(data) for data in journal_data]
 
@@ -509,17 +1008,19 @@ class Article():
         queries should be an (unpacked) list of compiled regex objects.
         """
         haystack = self.make_haystack()
-        # re.search() returns a match object or None. The call to any() will
-        # cast everything to booleans.
-        return [any([re.search(query, data) for data in haystack])
+        # search() returns a match object or None. The call to any() will
+        # cast everything to booleans, and stops at the first match.
+        return [any(query.search(data) for data in haystack)
                 for query in queries]
 
 
 class DOI():
+    __slots__ = ("doi",)
+
     def __init__(self, doi):
         self.doi = doi
 
-    async def to_article_cr(self, client_session=None):
+    async def to_article_cr(self, client_session=None, use_cache=True):
         """
         Uses Crossref API to obtain article metadata using a DOI. Returns a
         dictionary that is immediately suitable for use in _g.articleList.
@@ -540,6 +1041,10 @@ class DOI():
             DOI to look up.
         client_session : aiohttp.HTTPSession
             aiohttp session instance to use.
+        use_cache : bool, optional
+            Whether a cached Crossref response (see _g.crossrefCacheDir) may be
+            used instead of asking Crossref. Set this to False to make sure that
+            the metadata is up to date. The response is cached either way.
 
         Returns
         -------
@@ -548,90 +1053,97 @@ class DOI():
         DOI field, which will contain the DOI that was looked up.
         """
         crossref_url = f"https://api.crossref.org/works/{self.doi}"
-
-        # Instantiate a new ClientSession if none was provided. However, we do need
-        # to remember whether the ClientSession was provided: if it wasn't, then
-        # we should close it at the end.
-        if client_session is None:
-            # Make sure we have a polite header, though.
-            session = aiohttp.ClientSession(headers=_g.httpHeaders)
-        else:
-            session = client_session
+        article = Article(doi=self.doi)
+
+        data = _crossref_cache_get(self.doi) if use_cache else None
+        cached = data is not None
+        if not cached:
+            # Crossref won't have DOIs that another agency registered.
+            prefix = self.doi.split("/", 1)[0]
+            if _get_doi_agencies().get(prefix, "crossref") != "crossref":
+                return article
+            # Reuse an existing ClientSession if possible. However, we do need
+            # to remember whether we opened a new one: if so, then we should
+            # close it at the end.
+            session, owned = get_session(client_session)
+            try:
+                # Fetch the data from CrossRef
+                data = await _crossref_get(session, crossref_url)
+                # If that didn't work, find out whether it's because the DOI
+                # isn't a Crossref one, so that next time we know.
+                if data is None:
+                    await _learn_doi_agency(self.doi, session)
+            finally:
+                # If the ClientSession instance was opened here, close it.
+                if owned:
+                    await session.close()
 
         try:
-            article = Article(doi=self.doi)
-            # Fetch the data from CrossRef
-            async with session.get(crossref_url) as resp:
-                d = await resp.json()
-        except (aiohttp.client_exceptions.ContentTypeError,
-                aiohttp.client_exceptions.ClientResponseError):
-            # Lookup failed. But we can't just pass _ret.FAILURE, because we need
-            # to know which doi caused the error. So we create a blank Article with
-            # only the DOI field populated (everything else is by default set to
-            # None in __init__()).
-            pass
-        else:
-            d = d["message"]    # avoid repeating this subscript many times
-            # Minor hack to convert 'J.R.J.' to 'J. R. J.'.
-            # The alternative involves re.split(), I think that's overkill.
-            article.authors = [{"family": normalize("NFKC", auth["family"]),
-                                "given": normalize("NFKC", auth["given"].replace(". ", ".").replace(".",". ").rstrip())}
-                               for auth in d["author"]]
-            article.year = int(d["published-print"]["date-parts"][0][0]) \
-                if "published-print" in d \
-                else int(d["published-online"]["date-parts"][0][0])
-            article.journal_long = d["container-title"][0]
-
-            # Short journal title.
-            if "short-container-title" in d:
-                try:
-                    article.journal_short = d["short-container-title"][0]
-                except IndexError:
-                    # 10.1126/science.280.5362.421, for example, has an empty list
-                    # in d["short-container-title"]...
-                    article.journal_short = article.journal_long
-            else:
+            if data is None:
+                raise ValueError("lookup failed")
+            d = json_loads(data)
+        except ValueError:
+            # Lookup failed. But we can't just pass _ret.FAILURE, because we
+            # need to know which doi caused the error. So we return a blank
+            # Article with only the DOI field populated (everything else is by
+            # default set to None in __init__()).
+            return article
+
+        d = d["message"]    # avoid repeating this subscript many times
+        article.authors = [{"family": _nfkc(auth["family"]),
+                            "given": _nfkc(_space_initials(auth["given"]))}
+                           for auth in d["author"]]
+        article.year = int(d["published-print"]["date-parts"][0][0]) \
+            if "published-print" in d \
+            else int(d["published-online"]["date-parts"][0][0])
+        article.journal_long = d["container-title"][0]
+
+        # Short journal title.
+        if "short-container-title" in d:
+            try:
+                article.journal_short = d["short-container-title"][0]
+            except IndexError:
+                # 10.1126/science.280.5362.421, for example, has an empty list
+                # in d["short-container-title"]...
                 article.journal_short = article.journal_long
-            if article.journal_short in _g.journalReplacements:
-                article.journal_short = _g.journalReplacements[article.journal_short]
+        else:
+            article.journal_short = article.journal_long
+        if article.journal_short in _g.journalReplacements:
+            article.journal_short = _g.journalReplacements[article.journal_short]
 
-            # Process title
-            article.title = d["title"][0]
-            # Convert Greek letters in ACS titles to their Unicode equivalents
-            for i in _g.greek2Unicode.keys():
-                if f".{i}." in article.title:
-                    article.title = article.title.replace(f".{i}.", _g.greek2Unicode[i])
+        # Process title
+        article.title = d["title"][0]
+        # Convert Greek letters in ACS titles to their Unicode equivalents
+        article.title = _greek_regex.sub(
+            lambda m: _g.greek2Unicode[m.group(1)], article.title)
 
-            # Volume
-            try:
-                article.volume = int(d["volume"])
-            except KeyError:   # no volume
-                pass
-            except ValueError:  # it's a range (!!!)
-                article.volume = d["volume"]
-            # Issue
-            try:
-                article.issue = int(d["issue"])
-            except KeyError:   # no issue
-                pass
-            except ValueError:  # it's a range (!!!)
-                article.issue = d["issue"]
-            # Pages
-            try:
-                article.pages = d["page"]
-            except KeyError:
-                pass
-        finally:
-            # If the ClientSession instance wasn't provided, close it.
-            if client_session is None:
-                await session.close()
+        # Volume
+        try:
+            article.volume = int(d["volume"])
+        except KeyError:   # no volume
+            pass
+        except ValueError:  # it's a range (!!!)
+            article.volume = d["volume"]
+        # Issue
+        try:
+            article.issue = int(d["issue"])
+        except KeyError:   # no issue
+            pass
+        except ValueError:  # it's a range (!!!)
+            article.issue = d["issue"]
+        # Pages
+        try:
+            article.pages = d["page"]
+        except KeyError:
+            pass
 
-        # We can't put the return inside the finally, because exceptions that occur
-        # in the else block are only raised *after* the finally block. So, if the
-        # return is placed inside finally, exceptions are never raised.
+        # Only cache responses that could be used, so that a bad one doesn't
+        # stick around.
+        if not cached:
+            _crossref_cache_put(self.doi, data)
         return article
 
-    def to_article(self, metadata=True):
+    def to_article(self, metadata=True, use_cache=True):
         """
         Convert a DOI to an article. Useful as an external API as the user need
         not bother with managing asyncio coroutines.
@@ -651,6 +1163,8 @@ class DOI():
             DOI to look up.
         get_metadata : bool, optional
             Whether to fetch metadata from Crossref.
+        use_cache : bool, optional
+            Whether a cached Crossref response may be used. See to_article_cr().
 
         Returns
         -------
@@ -664,12 +1178,81 @@ class DOI():
         if not metadata:
             return Article(doi=self.doi)
         else:
-            article = asyncio.run(self.to_article_cr())
+            article = asyncio.run(self.to_article_cr(use_cache=use_cache))
             if article.title is None:
                 raise ValueError(f"Invalid DOI '{self.doi}' given.")
             else:
                 return article
 
+    @staticmethod
+    async def to_articles_cr(dois, client_session=None, spinner=None,
+                             use_cache=True):
+        """
+        Looks up metadata for several DOIs concurrently. All the lookups share
+        the same aiohttp.ClientSession, so connections are reused instead of
+        being set up again for every DOI.
+
+        Parameters
+        ----------
+        dois : list of str
+            DOIs to look up.
+        client_session : aiohttp.ClientSession, optional
+            aiohttp session instance to use. If not provided, the main
+            session is reused if it is open; otherwise a new one is created
+            and closed afterwards.
+        spinner : Spinner, optional
+            If provided, this is incremented by 1 as each lookup finishes.
+        use_cache : bool, optional
+            Whether cached Crossref responses may be used. See to_article_cr().
+
+        Returns
+        -------
+        List of Article instances, in the same order as dois. As with
+        to_article_cr(), an unsuccessful lookup gives an Article where only
+        the DOI field is populated.
+        """
+        session, owned = get_session(client_session)
+        # Don't hit Crossref with too many requests at once.
+        semaphore = asyncio.Semaphore(_g.ahMaxRequests)
+
+        async def to_article_bounded(doi):
+            async with semaphore:
+                article = await DOI(doi).to_article_cr(client_session=session,
+                                                       use_cache=use_cache)
+            if spinner is not None:
+                spinner.increment(1)
+            return article
+
+        try:
+            return await asyncio.gather(*[to_article_bounded(doi)
+                                          for doi in dois])
+        finally:
+            if owned:
+                await session.close()
+
+    @staticmethod
+    def to_articles(dois):
+        """
+        Convert several DOIs to articles, fetching all the metadata
+        concurrently. Like to_article(), this is for use outside of
+        coroutines; inside one, use:
+
+            articles = await DOI.to_articles_cr(dois)
+
+        Unlike to_article(), invalid DOIs do not raise an error. Instead, the
+        corresponding Article will only have its doi attribute populated.
+
+        Parameters
+        ----------
+        dois : list of str
+            DOIs to look up.
+
+        Returns
+        -------
+        List of Article instances, in the same order as dois.
+        """
+        return asyncio.run(DOI.to_articles_cr(dois))
+
     def to_citation(self, type):
         """
         Generates a citation from a DOI via an Article instance. Looks up
@@ -708,103 +1291,83 @@ class DOI():
         doi_url = "https://doi.org/{}".format(self.doi)
         publisher = None
 
-        class _PublisherFound(Exception):
-            pass
-        # First item is the regex to match against.
-        # Second item is the string to check the matched group for.
-        publisherRegex = {
-            'wiley': [re.compile(r"""<meta name=["']citation_publisher["']\s+content=["'](.+?)["']\s*/?>"""),
-                      "John Wiley"],
-            'elsevier': [re.compile(r"""<input type="hidden" name="redirectURL" value="https%3A%2F%2Fwww.sciencedirect.com%2Fscience%2Farticle%2Fpii%2F(.+?)%3Fvia%253Dihub" id="redirectURL"/>"""),
-                         ""],
-            'tandf': [re.compile(r"""<meta name=["']dc.Publisher["']\s+content=["'](.+?)["']\s*/?>"""),
-                      "Taylor"],
-            'annrev': [re.compile(r"""<meta name=["']dc.Publisher["']\s+content=["'](.+?)["']\s*/?>"""),
-                       "Annual Reviews"],
-            'rsc': [re.compile(r"""<meta content=["']https://pubs.rsc.org/en/content/articlepdf/(.+?)["']\s+name="citation_pdf_url"\s*/>"""),
-                    ""],
-        }
-        publisherFmtStrings = {
-            "acs": "https://pubs.acs.org/doi/pdf/{}",
-            "wiley": "https://onlinelibrary.wiley.com/doi/pdfdirect/{}",
-            "elsevier": "https://www.sciencedirect.com/science/article/pii/{}/pdfft",
-            "nature": "https://www.nature.com/articles/{}.pdf",
-            "science": "https://science.sciencemag.org/content/sci/{}.full.pdf",
-            "springer": "https://link.springer.com/content/pdf/{}.pdf",
-            "tandf": "https://www.tandfonline.com/doi/pdf/{}",
-            "annrev": "https://www.annualreviews.org/doi/pdf/{}",
-            "rsc": "https://pubs.rsc.org/en/content/articlepdf/{}",
-        }
-
-        # Create a new ClientSession if one wasn't provided
-        if client_session is None:
-            # Make sure we have a polite header, though.
-            session = aiohttp.ClientSession(headers=_g.httpHeaders)
-        else:
-            session = client_session
+        # Create a new ClientSession only if there isn't one to reuse
+        session, owned = get_session(client_session)
         try:
             async with session.get(doi_url) as resp:
+                # Join up the values of each header we look at, so that each
+                # check below is just one substring search.
+                cookies = "\n".join(resp.headers.getall("Set-Cookie", []))
+                hosts = "\n".join(resp.headers.getall("X-Forwarded-Host", []))
+                links = "\n".join(resp.headers.getall("Link", []))
                 # Shortcut for ACS, don't need to read content
-                if any("pubs.acs.org" in h
-                       for h in resp.headers.getall("Set-Cookie", [])):
+                if "pubs.acs.org" in cookies:
                     publisher = "acs"
                     identifier = self.doi
                     raise _PublisherFound
                 # Shortcut for Nature, don't need to read content
-                elif any("www.nature.com" in h
-                         for h in resp.headers.getall("X-Forwarded-Host", [])):
+                elif "www.nature.com" in hosts:
                     publisher = "nature"
                     identifier = self.doi.split('/', maxsplit=1)[1]
                     raise _PublisherFound
                 # Shortcut for Science, don't need to read content.
                 # Note that this doesn't work for Sci Advances
-                elif any("science.sciencemag.org" in h
-                         for h in resp.headers.getall("Link", [])):
+                elif "science.sciencemag.org" in links:
                     publisher = "science"
                     identifier = resp.headers["Link"].split(">")[0].split("/content/")[1]
                     raise _PublisherFound
                 # Shortcut for Springer
-                elif any(".springer.com" in h
-                         for h in resp.headers.getall("Set-Cookie", [])):
+                elif ".springer.com" in cookies:
                     publisher = "springer"
                     identifier = self.doi
                     raise _PublisherFound
                 # Shortcut for Taylor and Francis
-                elif any(".tandfonline.com" in h
-                         for h in resp.headers.getall("Set-Cookie", [])):
+                elif ".tandfonline.com" in cookies:
                     publisher = "tandf"
                     identifier = self.doi
                     raise _PublisherFound
                 # Otherwise, start reading the content
                 else:
-                    e = resp.get_encoding()
+                    prefilter = _publisher_any_regex.search
+                    searches = _publisher_searches
                     async for line in resp.content:
-                        line = line.decode(e)  # it's read as bytes
-                        # Search the line for every regex
-                        for pname, regexKeyword in publisherRegex.items():
-                            match = regexKeyword[0].search(line)
-                            if match and regexKeyword[1] in match.group(1):
-                                publisher = pname
-                                if publisher in ["wiley", "tandf", "annrev"]:
-                                    identifier = self.doi
-                                elif publisher in ["elsevier"]:
-                                    identifier = match.group(1)
-                                elif publisher in ["rsc"]:
-                                    identifier = match.group(1)
-                                raise _PublisherFound
+                        if prefilter(line):
+                            # Search the line for every regex
+                            for pname, search, keyword in searches:
+                                match = search(line)
+                                if match and keyword in match.group(1):
+                                    publisher = pname
+                                    if publisher in ["wiley", "tandf",
+                                                     "annrev"]:
+                                        identifier = self.doi
+                                    # The identifiers are parts of URLs,
+                                    # i.e. ASCII. (resp.get_encoding() can't
+                                    # be used, as the body hasn't been read.)
+                                    elif publisher in ["elsevier"]:
+                                        identifier = match.group(1).decode(
+                                            "ascii")
+                                    elif publisher in ["rsc"]:
+                                        identifier = match.group(1).decode(
+                                            "ascii")
+                                    raise _PublisherFound
+                        # Past the <head>, only Elsevier is left to look for.
+                        if (searches is _publisher_searches
+                                and b"</head>" in line):
+                            prefilter = _publisher_body_prefilter
+                            searches = _publisher_body_searches
         except (aiohttp.client_exceptions.ContentTypeError,
                 aiohttp.client_exceptions.InvalidURL,
                 aiohttp.client_exceptions.ClientConnectorError):
             result = _error(f"to_full_pdf_url: URL '{url_doi}' not accessible."
                             f" Do you have access to the full text?")
         except _PublisherFound:
-            result = publisherFmtStrings[publisher].format(identifier)
+            result = _publisher_pdf_urls[publisher].format(identifier)
         else:
             result = _error(f"to_full_pdf_url: could not find full text for "
                             f"doi {self.doi}")
 
         # Close the ClientSession if it was newly opened
-        if client_session is None:
+        if owned:
             await session.close()
         return result
 
@@ -814,8 +1377,9 @@ class DOI():
         Tries to extract a DOI from a PDF file. Returns _ret.FAILURE if it
         can't.
 
-        This method is fairly crude. It just utilises strings(1) and some magic
-        regexes.
+        This method is fairly crude. It just looks for text which mentions a
+        DOI (like `strings | grep -i doi` would) and runs some magic regexes on
+        it.
 
         Parameters
         ----------
@@ -827,46 +1391,57 @@ class DOI():
         -------
         DOI class instance. The actual DOI can be accessed as the doi attribute.
         """
-        raw_regexes = [
-            r"""<prism:doi>(10.\d{4,9}/[-._;()/:a-zA-Z0-9]+)</prism:doi>""",
-            r"""["'](?:doi|DOI):(10.\d{4,9}/[-._;()/:a-zA-Z0-9]+)["']""",
-            r"""URI\s*\(https?://doi.org/(10.\d{4,9}/[-._;()/:a-zA-Z0-9]+)\)\s*>""",
-            r"""URI\s*\((?:https?://)?www.nature.com/doifinder/(10.\d{4,9}/[-._;()/:a-zA-Z0-9]+)\)\s*>""",
-            # This one works for some ACIE papers, but is too risky. It matches
-            # against DOIs of cited papers too. Better to use WPS-ARTICLEDOI.
-            # r"""/URI\(https?://(?:dx)?.doi.org/(10.\d{4,9}/[-._;()/:a-zA-Z0-9]+)\)""",
-            r"""/WPS-ARTICLEDOI\s*\((10.\d{4,9}/[-._;()/:a-zA-Z0-9]+)\)""",
-            r"""\((?:doi|DOI):\s*(10.\d{4,9}/[-._;()/:a-zA-Z0-9]+)\)""",
-            r"""<rdf:li.+>(?:doi|DOI):(10.\d{4,9}/[-._;()/:a-zA-Z0-9]+)</rdf:li>""",
-        ]
-        regexes = [re.compile(regex) for regex in raw_regexes]
-        class _DOIFound(Exception):
-            pass
-
         p = Path(path)
         if not (p.exists() or p.is_file()):
             return _error(f"from_pdf: invalid path '{p}' given")
 
-        strings = subprocess.Popen(["strings", p], stdout=subprocess.PIPE)
-        grep = subprocess.Popen(["grep", "-i", "doi"], stdin=strings.stdout, stdout=subprocess.PIPE)
-        try:
-            for line in grep.stdout:
-                line = line.decode(_g.gpe).strip()
-                for regex in regexes:
-                    match = regex.search(line)
-                    if match:
-                        raise _DOIFound(match.group(1))
-        except _DOIFound as e:
-            doi = e.args[0]
-            # Prune away any extra parentheses at the end.
-            nopen = doi.count('(')
-            nclose = doi.count(')')
-            if nopen != nclose:
-                doi = doi.rsplit(')', maxsplit=(nclose - nopen))[0]
-            # Report success.
-            return DOI(doi)
-        else:
-            return _error(f"from_pdf: could not find DOI from '{p}'")
+        with open(p, "rb") as fp:
+            # Map the file instead of reading it in, so that big PDFs aren't
+            # copied into memory. Empty files can't be mapped, but then there
+            # is nothing to find anyway.
+            if os.fstat(fp.fileno()).st_size == 0:
+                return _error(f"from_pdf: could not find DOI from '{p}'")
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                try:
+                    for line in _doi_lines(data):
+                        line = line.strip()
+                        if not _pdf_doi_any_regex.search(line):
+                            continue
+                        # Something matched, but we still try the regexes in
+                        # order, so that the most reliable one wins.
+                        for regex in _pdf_doi_regexes:
+                            match = regex.search(line)
+                            if match:
+                                raise _DOIFound(match.group(1))
+                except _DOIFound as e:
+                    doi = e.args[0]
+                else:
+                    return _error(f"from_pdf: could not find DOI from '{p}'")
+
+        # Prune away any extra parentheses at the end.
+        # Cut just before the extra trailing ')'s.
+        extra = doi.count(')') - doi.count('(')
+        if extra > 0:
+            end = len(doi)
+            for _ in range(extra):
+                end = doi.rindex(')', 0, end)
+            doi = doi[:end]
+        elif extra < 0:
+            # Unclosed '(': keep only the part before the first ')'.
+            doi = doi.partition(')')[0]
+        # Report success.
+        return DOI(doi)
+
+    @staticmethod
+    async def from_pdf_cr(path):
+        """
+        Asynchronous version of from_pdf(). The scan runs in the default
+        executor, so that it doesn't block the event loop. The scanning itself
+        holds the GIL, so several of these running at once only overlap in
+        reading the files, not in searching them.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, DOI.from_pdf, path)
 
 
 class Spinner():
@@ -903,27 +1478,29 @@ class Spinner():
     async def run(self):
         write = sys.stdout.write
         flush = sys.stdout.flush
+        # Only the spinner character and the number done change from one
+        # frame to the next, so the rest of the message is built once. Each
+        # frame starts with a carriage return to overwrite the previous one.
+        prefix = f" {self.message} ("
+        suffix = f"/{self.fstr.format(self.total)}{self.units})"
+        # If the output isn't going to a terminal, nobody will see the
+        # animation (and the carriage returns just clutter up the output), so
+        # only the final line is printed.
+        animate = sys.stdout.isatty()
+        frames = cycle("|/-\\") if animate else ()
         try:
-            for c in cycle("|/-\\"):
-                full_message = (f"{c} {self.message} "
-                                f"({self.fstr.format(self.done)}/"
-                                f"{self.fstr.format(self.total)}"
-                                f"{self.units})")
-                write(full_message)
+            for c in frames:
+                write(f"\r{c}{prefix}{self.fstr.format(self.done)}{suffix}")
                 flush()
                 await asyncio.sleep(0.1)
                 self.time += 0.1
-                write('\x08' * len(full_message))
-                flush()
+            # Not animating, so just wait until we're cancelled.
+            while True:
+                await asyncio.sleep(3600)
         except asyncio.CancelledError:
-            write('\x08' * len(full_message))
-            flush()
-            full_message = (f"- {self.message} "
-                            f"({self.fstr.format(self.total)}/"
-                            f"{self.fstr.format(self.total)}"
-                            f"{self.units})")
-            write(full_message)
-            print()
+            if animate:
+                write("\r")
+            print(f"-{prefix}{self.fstr.format(self.total)}{suffix}")
 
     def increment(self, inc):
         """
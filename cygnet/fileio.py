@@ -5,8 +5,6 @@ fileio.py
 Functions involving reading / writing to a file.
 """
 
-from pathlib import Path
-
 import yaml
 
 from .cygcls import Article
@@ -66,6 +64,6 @@ def write_articles(articles, fname, force=False):
                                     "does not exist.")
 
     # Serialise the articles as dictionaries.
-    article_dicts = [vars(article) for article in articles]
+    article_dicts = [article.to_dict() for article in articles]
     with open(fname, "w") as fp:
         yaml.dump_all(article_dicts, fp)
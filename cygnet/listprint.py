@@ -7,10 +7,10 @@ All functions needed to print lists. It's surprisingly complicated!
 
 
 import os
-from copy import deepcopy
 from itertools import zip_longest
 
 from ._shared import *
+from .cygcls import get_listings
 
 _formatstr = "{0:<{1}}{2:{3}}{4:<{5}}{6:{7}}{8:{9}}"
 
@@ -36,8 +36,8 @@ def print_list(articles, refnos, max_auth=5):
     if len(articles) != len(refnos):
         raise ValueError("articles and refnos do not have same length")
 
-    # Make a copy of the articles
-    articles = deepcopy(articles)
+    # Nothing here modifies the articles, so there's no need to copy them
+    # (which also means that their cached author lists etc. get reused).
 
     # Calculate field sizes and set format string
     field_sizes = get_field_sizes(articles, refnos)
@@ -45,9 +45,12 @@ def print_list(articles, refnos, max_auth=5):
     # Construct and print the list header
     print_list_head(field_sizes)
 
-    # Print all articles
+    # Print all articles. The pdf and si folders only need to be checked once
+    # for the whole list.
+    listings = get_listings()
     for article, refno in zip(articles, refnos):
-        print_list_article(article, refno, field_sizes, max_auth=max_auth)
+        print_list_article(article, refno, field_sizes, max_auth=max_auth,
+                           listings=listings)
 
 
 def print_list_head(field_sizes):
@@ -68,7 +71,7 @@ def print_list_head(field_sizes):
     print("-" * sum(field_sizes.values()))
 
 
-def print_list_article(article, refno, field_sizes, max_auth):
+def print_list_article(article, refno, field_sizes, max_auth, listings=None):
     """
     Print one article.
 
@@ -79,6 +82,8 @@ def print_list_article(article, refno, field_sizes, max_auth):
                              are generated by get_field_sizes().
         max_auth (int)     : Number of authors to print. If 0 or negative
                              prints all authors.
+        listings (tuple)   : The listings of the pdf and si folders, from
+                             get_listings(). Optional.
 
     Returns: None.
     """
@@ -105,8 +110,9 @@ def print_list_article(article, refno, field_sizes, max_auth):
     title_column = [article.title[i:i+n]
                     for i in range(0, len(article.title), n)]
     # Then we tack on the DOI and the availability string.
+    availability = article.get_availability(listings)
     title_column.extend([article.doi,
-                         article.get_availability_string()])
+                         article.get_availability_string(availability)])
 
     # Now, print everything!
     for number, author, year, journal, title in zip_longest(number_column,
@@ -7,6 +7,7 @@ Class that controls the main REPL.
 
 import asyncio
 import re
+import sys
 from pathlib import Path
 
 import prompt_toolkit as pt
@@ -16,6 +17,30 @@ from ._shared import *
 from ._version import __version__
 
 
+# The commands that peepPrompt.loop() can run. Each entry has the allowed
+# abbreviations, the function to call with the arguments, and whether the
+# command can change the database (in which case the history is saved first,
+# so that it can be undone).
+_commands = [
+    (["c", "ci", "cit", "cite"], commands.cli_cite, False),
+    (["o", "op", "ope", "open"], commands.cli_open, False),
+    (["w", "wr", "wri", "writ", "write"], commands.cli_write, False),
+    (["l", "li", "ls", "lis", "list"], commands.cli_list, False),
+    (["cd"], commands.cli_cd, False),
+    (["e", "ed", "edi", "edit"], commands.cli_edit, True),
+    (["a", "ad", "add"], commands.cli_add, True),
+    (["d", "de", "del", "dele", "delet", "delete"], commands.cli_delete, True),
+    (["u", "up", "upd", "upda", "updat", "update"], commands.cli_update, True),
+    (["s", "se", "search"], commands.cli_search, False),
+    (["so", "sor", "sort"], commands.cli_sort, True),
+    (["i", "im", "imp", "impo", "impor", "import"], commands.cli_import, True),
+    (["ap", "addp", "addpd", "addpdf"], commands.cli_addpdf, False),
+    (["dp", "delp", "delpd", "delpdf", "deletep", "deletepd", "deletepdf"],
+     commands.cli_deletepdf, False),
+    (["f", "fe", "fet", "fetc", "fetch"], commands.cli_fetch, False),
+]
+
+
 class peepPrompt():
     """
     Interactive prompt.
@@ -34,6 +59,22 @@ class peepPrompt():
         return msg
 
     commentSymbol = '#'
+    # Need a tiny sleep after each command to paper over a weird bug.
+    # Try removing this and spamming 'l' before quitting to see the bug.
+    # There WILL be bugs if the time taken to print any output (e.g. 'l' with
+    # large databases) exceeds this sleep. With 3 references, printing takes
+    # a fraction of a millisecond. With 300 references it takes about 60 ms.
+    # patch_stdout() writes our output from a background thread, so a single
+    # turn of the event loop (sleep(0)) is NOT enough. It can be set to 0 when
+    # the prompt isn't being used interactively.
+    outputDelay = 0.1   # seconds
+    # Maps each abbreviation to (function, save_hist), so that a command can
+    # be found with a single lookup.
+    commandTable = {name: (fn, save_hist)
+                    for names, fn, save_hist in _commands for name in names}
+    # Splits at spaces, but not at escaped spaces.
+    splitRegex = re.compile(r'(?<!\\) ')
+    pathEscapes = tuple(_g.pathEscapes.items())
     session = pt.PromptSession()
 
     intro = (
@@ -65,18 +106,23 @@ class peepPrompt():
         # Remove anything after a comment
         if self.commentSymbol in line:
             line = line.split(self.commentSymbol)[0].rstrip()
-        # We need to split at spaces, but not at escaped spaces, e.g.
-        # in file names.
-        line = re.split(r'(?<!\\) ', line)
-        # Then replace the escaped spaces with ordinary spaces. We
-        # assume here that there is no other legitimate uses for
-        # escaped spaces, apart from file names.
-        line = [l.replace("\\ ", " ") for l in line]
-        # Replace other escaped characters, BUT only if the command is not
-        # "search" (for which we accept regex patterns as arguments).
-        if line[0] not in ["s", "se", "sea", "sear", "searc", "search"]:
-            for escapedChar, char in _g.pathEscapes:
-                line = [l.replace(escapedChar, char) for l in line]
+        # Every escape starts with a backslash, so without one a plain split
+        # is enough (this is by far the most common case).
+        if "\\" not in line:
+            line = line.split(" ")
+        else:
+            # We need to split at spaces, but not at escaped spaces, e.g.
+            # in file names.
+            line = self.splitRegex.split(line)
+            # Then replace the escaped spaces with ordinary spaces. We
+            # assume here that there is no other legitimate uses for
+            # escaped spaces, apart from file names.
+            line = [l.replace("\\ ", " ") for l in line]
+            # Replace other escaped characters, BUT only if the command is
+            # not "search" (for which we accept regex patterns as arguments).
+            if line[0] not in ["s", "se", "sea", "sear", "searc", "search"]:
+                for escapedChar, char in self.pathEscapes:
+                    line = [l.replace(escapedChar, char) for l in line]
         # Separate into command + arguments.
         cmd, args = line[0], line[1:]
         # Remove empty arguments.
@@ -89,10 +135,12 @@ class peepPrompt():
         # instead of "o 1" or "c 1d". Yes I'm lazy.
         # This one-liner is a bit obscure, but the alternative is a
         # full-fledged loop...
-        n = next((i for i, c in enumerate(cmd) if c.isdigit()), len(cmd))
-        if n < len(cmd):
-            args = [cmd[n:]] + args
-            cmd = cmd[:n]
+        # Purely alphabetic commands (the usual case) can skip this.
+        if not cmd.isalpha():
+            n = next((i for i, c in enumerate(cmd) if c.isdigit()), len(cmd))
+            if n < len(cmd):
+                args = [cmd[n:]] + args
+                cmd = cmd[:n]
 
         # Finally, check whether cmd is 'h' or 'help'
         help = cmd in ["h", "help"]
@@ -102,7 +150,9 @@ class peepPrompt():
                 cmd, args = args[0], args[1:]
             else:
                 cmd, args = "", []
-        return cmd, args, help
+        # The abbreviations in commandTable are interned literals, so this
+        # lets the lookup match on identity instead of comparing characters.
+        return sys.intern(cmd), args, help
 
     async def loop(self):
         print(self.intro)
@@ -136,55 +186,13 @@ class peepPrompt():
                     if cmd in ["q", "qu", "qui", "quit",             # QUIT
                                "zzzpeep"]:
                         break
-                    elif cmd in ["c", "ci", "cit", "cite"]:          # CITE
-                        await commands.cli_cite(args, help=help)
-                        # asyncio.create_task(commands.cli_cite(args, help=help))
-                    elif cmd in ["o", "op", "ope", "open"]:          # OPEN
-                        commands.cli_open(args, help=help)
-                    elif cmd in ["w", "wr", "wri", "writ",           # WRITE
-                                 "write"]:
-                        commands.cli_write(args, help=help)
-                    elif cmd in ["l", "li", "ls", "lis", "list"]:    # LIST
-                        commands.cli_list(args, help=help)
-                    elif cmd in ["cd"]:                              # CD
-                        commands.cli_cd(args, help=help)
-                    elif cmd in ["e", "ed", "edi", "edit"]:          # EDIT
-                        if help is False:
-                            _saveHist(cmd, args)
-                        commands.cli_edit(args, help=help)
-                    elif cmd in ["a", "ad", "add"]:                  # ADD
-                        if help is False:
-                            _saveHist(cmd, args)
-                        await commands.cli_add(args, help=help)
-                    elif cmd in ["d", "de", "del", "dele",           # DELETE
-                                 "delet", "delete"]:
-                        if help is False:
-                            _saveHist(cmd, args)
-                        await commands.cli_delete(args, help=help)
-                    elif cmd in ["u", "up", "upd", "upda",           # UPDATE
-                                 "updat", "update"]:
-                        if help is False:
-                            _saveHist(cmd, args)
-                        await commands.cli_update(args, help=help)
-                    elif cmd in ["s", "se", "search"]:               # SEARCH
-                        commands.cli_search(args, help=help)
-                    elif cmd in ["so", "sor", "sort"]:               # SORT
-                        if help is False:
-                            _saveHist(cmd, args)
-                        commands.cli_sort(args, help=help)
-                    elif cmd in ["i", "im", "imp", "impo",           # IMPORT
-                                 "impor", "import"]:
-                        if help is False:
+                    elif cmd in self.commandTable:
+                        fn, save_hist = self.commandTable[cmd]
+                        if save_hist and help is False:
                             _saveHist(cmd, args)
-                        await commands.cli_import(args, help=help)
-                    elif cmd in ["ap", "addp", "addpd", "addpdf"]:   # ADDPDF
-                        await commands.cli_addpdf(args, help=help)
-                    elif cmd in ["dp", "delp", "delpd", "delpdf",    # DELETEPDF
-                                 "deletep", "deletepd", "deletepdf"]:
-                        await commands.cli_deletepdf(args, help=help)
-                    elif cmd in ["f", "fe", "fet", "fetc",           # FETCH
-                                 "fetch"]:
-                        await commands.cli_fetch(args, help=help)
+                        result = fn(args, help=help)
+                        if asyncio.iscoroutine(result):
+                            await result
                     elif cmd in ["un", "und", "undo"]:               # UNDO
                         _undo(help=help)
                     elif cmd in ["exec"] and _g.debug:               # EXEC
@@ -202,13 +210,6 @@ class peepPrompt():
                     else:                                            # unknown
                         _error("command '{}' not recognised".format(cmd))
 
-                    # Need a tiny sleep to paper over a weird bug.
-                    # Try removing this and spamming 'l' before quitting
-                    #  to see the bug.
-                    # There WILL be bugs if the time taken to print any
-                    #  output (e.g. 'l' with large databases) exceeds
-                    #  this sleep. With 3 references, printing takes a
-                    #  fraction of a millisecond. With 300 references
-                    #  it takes about 60 ms.
-                    await asyncio.sleep(0.1)   # 100 ms.
+                    # See outputDelay.
+                    await asyncio.sleep(self.outputDelay)
         return
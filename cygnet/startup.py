@@ -10,19 +10,14 @@ import os
 import sys
 import asyncio
 import argparse
-import re
 from pathlib import Path
-from enum import Enum
-from datetime import datetime, timezone
 
 import yaml
 import aiohttp
-import prompt_toolkit as pt
 
 from . import prompt
 from . import fileio
 from . import backup
-from . import commands
 from ._shared import *
 
 
@@ -67,10 +62,10 @@ def main():
         cols = max(cols, 175)
         rows = max(rows, 50)
         sys.stdout.write(f"\x1b[8;{rows};{cols}t")
-        # Run main coroutine until complete
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(main_coro())
-        loop.close()
+        # Run main coroutine until complete. asyncio.run() also cancels
+        # leftover tasks and shuts down the default executor (used for file
+        # writes and PDF scans) before closing the loop.
+        asyncio.run(main_coro())
     else:
         _error(f"Cygnet: directory {args.path} does not exist")
 
@@ -82,9 +77,13 @@ async def main_coro():
     # Start autosave task
     t_autosave = asyncio.create_task(backup.autosave())
 
+    # The connector has to be made inside a running event loop.
+    connector = aiohttp.TCPConnector(**_g.ahConnectorOptions)
     # Launch aiohttp session with nice user-agent default header.
-    async with aiohttp.ClientSession(connector=_g.ahConnector,
+    async with aiohttp.ClientSession(connector=connector,
                                      headers=_g.httpHeaders,
+                                     timeout=_g.ahTimeout,
+                                     read_bufsize=_g.ahReadBufsize,
                                      raise_for_status=True) as ahSession:
         # ahSession only exists in this context manager block, so to avoid
         # having to pass it 1 million times through subroutines, we bind it
@@ -92,7 +91,7 @@ async def main_coro():
         _g.ahSession = ahSession
         # Start the REPL
         pmt = prompt.peepPrompt()
-        pmtloop = await pmt.loop()
+        await pmt.loop()
 
     # Program shutdown code.
     # Backup 
@@ -25,10 +25,14 @@ setuptools.setup(
     python_requires='>=3.7',
     install_requires=[
         "prompt_toolkit>=3.0.11",
-        "aiohttp",
+        "aiohttp>=3.7",
         "unidecode",
         "pyyaml"
     ],
+    # orjson is used to parse Crossref responses if it's installed
+    extras_require={
+        "fast": ["orjson"],
+    },
     # Entry points (command-line)
     entry_points = {
         'console_scripts': ['cygnet=cygnet.startup:main',